@@ -1,7 +1,8 @@
+import os
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import plotly.express as px
+import plotly.io as pio
 import numpy as np
 
 # Set page config
@@ -11,12 +12,48 @@ st.set_page_config(
     layout="wide"
 )
 
+# Chart font sizes, set once for every figure instead of per chart. Layered on the
+# "streamlit" template that Streamlit registers as the default, so charts keep its theme
+pio.templates['vnl'] = dict(layout=dict(
+    title_font_size=16,
+    xaxis_title_font_size=14,
+    yaxis_title_font_size=14
+))
+pio.templates.default = 'streamlit+vnl'
+
 # Load data
-@st.cache_data
-def load_data():
-    return pd.read_csv('VNL2023.csv')
+def parse_csv():
+    try:
+        df = pd.read_csv('VNL2023.csv', engine='pyarrow')
+    except ImportError:
+        df = pd.read_csv('VNL2023.csv')
+    # Low-cardinality labels as categories so isin/groupby work on integer codes
+    for col in ('Position', 'Country'):
+        df[col] = df[col].astype('category')
+    # Narrow numeric dtypes so aggregations move half the bytes
+    for col in ('Attack', 'Block', 'Serve', 'Set', 'Dig', 'Receive'):
+        df[col] = pd.to_numeric(df[col], downcast='float')
+    df['Age'] = pd.to_numeric(df['Age'], downcast='unsigned')
+    return df
 
-df = load_data()
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_data(data_version):
+    # The CSV is converted to Parquet once (keeping the dtypes above) and memory-mapped afterwards
+    path = 'VNL2023.parquet'
+    try:
+        if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime('VNL2023.csv'):
+            # Write to a temp file and swap it in so an interrupted write never leaves a truncated file
+            parse_csv().to_parquet(path + '.tmp')
+            os.replace(path + '.tmp', path)
+        return pd.read_parquet(path, memory_map=True)
+    except (ImportError, OSError, ValueError):
+        # ValueError covers pyarrow.lib.ArrowInvalid from an unreadable Parquet file
+        return parse_csv()
+
+# The CSV's mtime is part of every cache key below, so replacing the file invalidates
+# the loaded frame and every result derived from it, including those persisted to disk
+data_version = os.path.getmtime('VNL2023.csv')
+df = load_data(data_version)
 
 # Title and description
 st.title("🏐 Volleyball Nations League 2023 - Player Statistics")
@@ -25,30 +62,186 @@ Exploratory Data Analysis of player performance statistics from the 2023 Volleyb
 """)
 
 # Sidebar filters
+# _df is skipped by the hasher; data_version ties the cached entry to the loaded frame
+@st.cache_resource(max_entries=1)
+def sidebar_domain(_df, data_version):
+    return dict(
+        positions=tuple(str(p) for p in _df['Position'].unique()),
+        age_min=int(_df['Age'].min()),
+        age_max=int(_df['Age'].max())
+    )
+
+domain = sidebar_domain(df, data_version)
+
 st.sidebar.header("Filters")
-selected_positions = st.sidebar.multiselect(
-    "Select positions to include",
-    options=df['Position'].unique(),
-    default=df['Position'].unique()
-)
+positions = domain['positions']
+if len(positions) <= 100:
+    selected_positions = st.sidebar.multiselect(
+        "Select positions to include",
+        options=positions,
+        default=positions
+    )
+else:
+    # Large domains would make the multiselect rebuild every option on each rerun, so "all"
+    # is a checkbox and the multiselect only ever holds up to 100 options: the current
+    # selection (kept so a new query doesn't drop it) plus matches for the search box
+    if st.sidebar.checkbox("Include all positions", value=True):
+        selected_positions = list(positions)
+    else:
+        selected = st.session_state.get('selected_positions', [])
+        query = st.sidebar.text_input("Filter positions").lower()
+        selected_set = set(selected)
+        matches = [p for p in positions if query in p.lower() and p not in selected_set]
+        selected_positions = st.sidebar.multiselect(
+            "Select positions to include",
+            options=list(selected) + matches[:max(0, 100 - len(selected))],
+            key='selected_positions'
+        )
 
 age_range = st.sidebar.slider(
     "Select age range",
-    min_value=int(df['Age'].min()),
-    max_value=int(df['Age'].max()),
-    value=(int(df['Age'].min()), int(df['Age'].max()))
+    min_value=domain['age_min'],
+    max_value=domain['age_max'],
+    value=(domain['age_min'], domain['age_max'])
 )
 
 # Apply filters
-filtered_df = df[
-    (df['Position'].isin(selected_positions)) & 
-    (df['Age'].between(age_range[0], age_range[1]))
-]
+@st.cache_resource(max_entries=1)
+def position_index(_df, data_version):
+    # Row positions for each Position value, built once per data version so filtering never rescans the column
+    positions = _df['Position'].to_numpy()
+    return {p: np.flatnonzero(positions == p) for p in _df['Position'].unique()}
+
+@st.cache_data
+def filtered_index(data_version, positions_key, age_lo, age_hi):
+    index = position_index(df, data_version)
+    rows = [index[p] for p in positions_key if p in index]
+    # Sort so the filtered frame keeps the original row order
+    rows = np.sort(np.concatenate(rows)) if rows else np.array([], dtype=np.int32)
+    ages = df['Age'].to_numpy()[rows]
+    return rows[(ages >= age_lo) & (ages <= age_hi)].astype(np.int32)
+
+# Every tab and helper slices df through the current filter's int32 row-position array,
+# shared in session state; any other key falls back to the cached filtered_index
+def get_filtered(data_version, positions_key, age_lo, age_hi):
+    filter_key = (data_version, positions_key, age_lo, age_hi)
+    if st.session_state.get('filt_key') == filter_key:
+        return df.iloc[st.session_state['filt_idx']]
+    return df.iloc[filtered_index(*filter_key)]
+
+# Sort the positions so the same selection hits the cache regardless of order
+filter_key = (data_version, tuple(sorted(selected_positions)), age_range[0], age_range[1])
+st.session_state['filt_key'] = filter_key
+st.session_state['filt_idx'] = filtered_index(*filter_key)
+
+# Cached aggregations, keyed on the filter so tabs only recompute when their inputs change.
+# filter_key carries the data version, so results persisted to disk survive server restarts
+# but are never served for a different CSV.
+# Each summary is a single groupby pass; the tabs slice out the columns they show.
+@st.cache_data(persist="disk", max_entries=256)
+def position_summary(filter_key):
+    return get_filtered(*filter_key).groupby('Position', observed=True).agg({
+        'Player': 'count',
+        'Attack': 'mean',
+        'Block': 'mean',
+        'Serve': 'mean',
+        'Set': 'mean',
+        'Dig': 'mean',
+        'Receive': 'mean'
+    })
+
+@st.cache_data(persist="disk", max_entries=256)
+def country_summary(filter_key):
+    return get_filtered(*filter_key).groupby('Country', observed=True).agg({
+        'Player': 'count', 
+        'Attack': 'mean',
+        'Block': 'mean',
+        'Age': 'mean'
+    }).sort_values('Player', ascending=False)
+
+def position_counts(filter_key):
+    return position_summary(filter_key)['Player'].sort_values(ascending=False)
+
+def position_skills(filter_key, skills_key):
+    return position_summary(filter_key)[list(skills_key)].transpose()
+
+def country_stats(filter_key, min_players):
+    stats = country_summary(filter_key)
+    return stats[stats['Player'] >= min_players]
+
+@st.cache_data(persist="disk", max_entries=256)
+def top_attackers(filter_key, top_n):
+    filtered = get_filtered(*filter_key)
+    attack = filtered['Attack'].to_numpy()
+    k = min(top_n, len(attack))
+    if not k:
+        return filtered[['Player', 'Country', 'Attack', 'Position', 'Age']]
+    # np.partition finds the k-th largest score in O(N); every row at or above it is kept
+    # in row order and stable-sorted, so ties resolve like nlargest(keep='first')
+    cutoff = np.partition(attack, -k)[-k]
+    idx = np.flatnonzero(attack >= cutoff)
+    idx = idx[np.argsort(-attack[idx], kind='stable')][:k]
+    return filtered.iloc[idx][['Player', 'Country', 'Attack', 'Position', 'Age']]
+
+def progress_column(values, label, format='%.1f'):
+    # Client-side bar scaled to the column's maximum, replacing the server-side Styler gradient
+    max_value = float(values.max()) if len(values) else 0.0
+    return st.column_config.ProgressColumn(label, format=format, min_value=0.0,
+                                           max_value=max_value if max_value > 0 else 1.0)
+
+# Cached charts: Plotly figures are rendered in the browser, so a cache hit costs no server-side drawing.
+# cache_resource hands back the same Figure object instead of unpickling a copy on every rerun.
+# Charts are keyed on the filter tuple rather than a DataFrame, so cache lookups never hash row data.
+@st.cache_resource(max_entries=64)
+def position_counts_chart(filter_key):
+    counts = position_counts(filter_key).rename_axis('Position').reset_index(name='Players')
+    fig = px.bar(counts, x='Position', y='Players', color='Position',
+                 color_discrete_sequence=px.colors.sequential.Viridis,
+                 title='Distribution of Players by Position',
+                 labels={'Players': 'Number of Players'})
+    fig.update_layout(showlegend=False)
+    return fig
+
+@st.cache_resource(max_entries=64)
+def position_skills_chart(filter_key, skills_key):
+    return px.imshow(position_skills(filter_key, skills_key), text_auto='.1f', aspect='auto',
+                     color_continuous_scale='YlGnBu',
+                     title='Average Skill Ratings by Position',
+                     labels={'x': 'Position', 'y': 'Skill', 'color': 'Rating'})
+
+@st.cache_resource(max_entries=64)
+def age_box_chart(filter_key):
+    return px.box(get_filtered(*filter_key), x='Position', y='Age', color='Position',
+                  color_discrete_sequence=px.colors.qualitative.Set2,
+                  title='Age Distribution by Position')
+
+@st.cache_resource(max_entries=64)
+def top_attack_chart(filter_key, top_n):
+    fig = px.bar(top_attackers(filter_key, top_n), x='Attack', y='Player', color='Position', orientation='h',
+                 color_discrete_sequence=px.colors.sequential.Viridis,
+                 title=f'Top {top_n} Players by Attack Score',
+                 labels={'Attack': 'Attack Score'})
+    fig.update_yaxes(categoryorder='total ascending')
+    return fig
+
+@st.cache_data(persist="disk", max_entries=256)
+def full_corr(filter_key):
+    # One pass over every candidate skill; individual selections are sliced from this matrix
+    return get_filtered(*filter_key)[['Attack', 'Block', 'Serve', 'Set', 'Dig', 'Receive', 'Age']].corr()
+
+@st.cache_resource(max_entries=64)
+def correlation_chart(filter_key, skills_key):
+    corr = full_corr(filter_key).loc[list(skills_key), list(skills_key)]
+    mask = np.triu(np.ones_like(corr, dtype=bool))
+    # Fix the color range to [-1, 1] so the same coefficient keeps its color across skill selections
+    return px.imshow(corr.where(~mask), text_auto='.2f', color_continuous_scale='RdBu_r',
+                     zmin=-1, zmax=1,
+                     title='Correlation Between Selected Skills')
 
 # Show filtered data
-st.sidebar.markdown(f"**Filtered Players:** {len(filtered_df)} of {len(df)}")
+st.sidebar.markdown(f"**Filtered Players:** {len(st.session_state['filt_idx'])} of {len(df)}")
 
-# Main content tabs
+# Main content tabs; each tab body is a fragment so its widgets only rerun that tab
 tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
     "Position Distribution", 
     "Skills by Position",
@@ -59,15 +252,10 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
 ])
 
 # Tab 1: Position Distribution
-with tab1:
+@st.fragment
+def render_tab1(filter_key):
     st.header("Player Position Distribution")
-    fig, ax = plt.subplots(figsize=(10, 6))
-    position_counts = filtered_df['Position'].value_counts()
-    sns.barplot(x=position_counts.index, y=position_counts.values, palette="viridis", ax=ax)
-    plt.title('Distribution of Players by Position', fontsize=16)
-    plt.xlabel('Position', fontsize=14)
-    plt.ylabel('Number of Players', fontsize=14)
-    st.pyplot(fig)
+    st.plotly_chart(position_counts_chart(filter_key), width="stretch")
     
     with st.expander("View position descriptions"):
         st.markdown("""
@@ -78,8 +266,12 @@ with tab1:
         - **L**: Libero (defensive specialist who can't attack)
         """)
 
+with tab1:
+    render_tab1(filter_key)
+
 # Tab 2: Skills by Position
-with tab2:
+@st.fragment
+def render_tab2(filter_key):
     st.header("Average Skill Ratings by Position")
     skills = ['Attack', 'Block', 'Serve', 'Set', 'Dig', 'Receive']
     
@@ -91,60 +283,56 @@ with tab2:
     )
     
     if selected_skills:
-        fig, ax = plt.subplots(figsize=(12, 8))
-        position_skills = filtered_df.groupby('Position')[selected_skills].mean().transpose()
-        sns.heatmap(position_skills, annot=True, cmap="YlGnBu", fmt=".1f", linewidths=.5, ax=ax)
-        plt.title('Average Skill Ratings by Position', fontsize=16)
-        plt.xlabel('Position', fontsize=14)
-        plt.ylabel('Skill', fontsize=14)
-        st.pyplot(fig)
+        st.plotly_chart(position_skills_chart(filter_key, tuple(selected_skills)), width="stretch")
     else:
         st.warning("Please select at least one skill to display")
 
+with tab2:
+    render_tab2(filter_key)
+
 # Tab 3: Age Analysis
-with tab3:
+@st.fragment
+def render_tab3(filter_key):
     st.header("Age Distribution Analysis")
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Age Distribution by Position")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.boxplot(x='Position', y='Age', data=filtered_df, palette="Set2", ax=ax)
-        plt.title('Age Distribution by Position', fontsize=16)
-        plt.xlabel('Position', fontsize=14)
-        plt.ylabel('Age', fontsize=14)
-        st.pyplot(fig)
+        st.plotly_chart(age_box_chart(filter_key), width="stretch")
     
     with col2:
         st.subheader("Age vs. Attack Performance")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.scatterplot(x='Age', y='Attack', hue='Position', data=filtered_df, palette="Set2", s=100, ax=ax)
-        plt.title('Attack Performance by Age', fontsize=16)
-        plt.xlabel('Age', fontsize=14)
-        plt.ylabel('Attack Score', fontsize=14)
-        st.pyplot(fig)
+        # Only the plotted columns are sent; the browser draws the points from a Vega-Lite spec
+        st.scatter_chart(get_filtered(*filter_key)[['Age', 'Attack', 'Position']],
+                         x='Age', y='Attack', color='Position', y_label='Attack Score')
+
+with tab3:
+    render_tab3(filter_key)
 
 # Tab 4: Top Attackers
-with tab4:
+@st.fragment
+def render_tab4(filter_key):
     st.header("Top Attacking Players")
     
-    top_n = st.slider("Select number of top players to show", 5, 20, 10)
+    # Inside a form the slider only triggers a rerun on submit, not on every step while dragging
+    with st.form("top_n_form"):
+        top_n = st.slider("Select number of top players to show", 5, 20, 10)
+        st.form_submit_button("Update")
     
-    top_attack = filtered_df.nlargest(top_n, 'Attack')[['Player', 'Country', 'Attack', 'Position', 'Age']]
+    top_attack = top_attackers(filter_key, top_n)
     
     # Show as both table and chart
-    st.dataframe(top_attack.style.background_gradient(subset=['Attack'], cmap='YlOrRd'))
+    st.dataframe(top_attack, column_config={'Attack': progress_column(top_attack['Attack'], 'Attack')})
     
-    fig, ax = plt.subplots(figsize=(12, 8))
-    sns.barplot(x='Attack', y='Player', hue='Position', data=top_attack, palette="viridis", dodge=False, ax=ax)
-    plt.title(f'Top {top_n} Players by Attack Score', fontsize=16)
-    plt.xlabel('Attack Score', fontsize=14)
-    plt.ylabel('Player', fontsize=14)
-    st.pyplot(fig)
+    st.plotly_chart(top_attack_chart(filter_key, top_n), width="stretch")
+
+with tab4:
+    render_tab4(filter_key)
 
 # Tab 5: Skill Correlations
-with tab5:
+@st.fragment
+def render_tab5(filter_key):
     st.header("Skill Correlations")
     
     skills = ['Attack', 'Block', 'Serve', 'Set', 'Dig', 'Receive', 'Age']
@@ -155,12 +343,7 @@ with tab5:
     )
     
     if len(selected_corr_skills) >= 2:
-        fig, ax = plt.subplots(figsize=(10, 8))
-        corr = filtered_df[selected_corr_skills].corr()
-        mask = np.triu(np.ones_like(corr, dtype=bool))
-        sns.heatmap(corr, mask=mask, annot=True, cmap="coolwarm", center=0, fmt=".2f", linewidths=.5, ax=ax)
-        plt.title('Correlation Between Selected Skills', fontsize=16)
-        st.pyplot(fig)
+        st.plotly_chart(correlation_chart(filter_key, tuple(selected_corr_skills)), width="stretch")
         
         with st.expander("Interpretation Guide"):
             st.markdown("""
@@ -173,54 +356,46 @@ with tab5:
     else:
         st.warning("Please select at least 2 skills to see correlations")
 
+with tab5:
+    render_tab5(filter_key)
+
 # Tab 6: Country Performance
-with tab6:
+@st.fragment
+def render_tab6(filter_key):
     st.header("Country Performance Analysis")
     
-    min_players = st.slider("Minimum players per country to include", 1, 10, 3)
+    with st.form("min_players_form"):
+        min_players = st.slider("Minimum players per country to include", 1, 10, 3)
+        st.form_submit_button("Update")
     
-    country_stats = filtered_df.groupby('Country').agg({
-        'Player': 'count', 
-        'Attack': 'mean',
-        'Block': 'mean',
-        'Age': 'mean'
-    }).sort_values('Player', ascending=False)
-    country_stats = country_stats[country_stats['Player'] >= min_players]
+    countries = country_stats(filter_key, min_players)
     
-    if not country_stats.empty:
+    if not countries.empty:
         col1, col2 = st.columns(2)
         
         with col1:
-            st.subheader("Country Representation")
-            fig, ax = plt.subplots(figsize=(12, 6))
-            sns.barplot(x=country_stats.index, y=country_stats['Player'], hue=country_stats.index, palette="viridis", legend=False, ax=ax)
-            plt.title(f'Players per Country (min {min_players} players)', fontsize=16)
-            plt.xlabel('Country', fontsize=14)
-            plt.ylabel('Number of Players', fontsize=14)
-            plt.xticks(rotation=45)
-            st.pyplot(fig)
+            st.subheader(f"Country Representation (min {min_players} players)")
+            # sort=False keeps country_stats' order (most players first) instead of alphabetical
+            st.bar_chart(countries['Player'], x_label='Country', y_label='Number of Players', sort=False)
         
         with col2:
             st.subheader("Average Attack by Country")
-            fig, ax = plt.subplots(figsize=(12, 6))
-            sns.barplot(x=country_stats.index, y=country_stats['Attack'], hue=country_stats.index, palette="rocket", legend=False, ax=ax)
-            plt.title('Average Attack Score by Country', fontsize=16)
-            plt.xlabel('Country', fontsize=14)
-            plt.ylabel('Average Attack Score', fontsize=14)
-            plt.xticks(rotation=45)
-            st.pyplot(fig)
+            st.bar_chart(countries['Attack'], x_label='Country', y_label='Average Attack Score', sort=False)
         
         st.subheader("Detailed Country Statistics")
-        st.dataframe(country_stats.style.background_gradient(subset=['Attack', 'Block'], cmap='YlOrRd'))
+        st.dataframe(countries, column_config={
+            'Attack': progress_column(countries['Attack'], 'Attack'),
+            'Block': progress_column(countries['Block'], 'Block', format='%.2f')
+        })
     else:
         st.warning(f"No countries have at least {min_players} players with current filters")
 
+with tab6:
+    render_tab6(filter_key)
+
 # Add footer
 st.markdown("---")
 st.markdown("""
 **Data Source**: Volleyball Nations League 2023 Player Statistics  
-**Created with**: Python, Streamlit, Pandas, Seaborn  
+**Created with**: Python, Streamlit, Pandas, Plotly  
 """)
-
-# Close all matplotlib figures to prevent memory leaks
-plt.close('all')
\ No newline at end of file